@@ -1,5 +1,39 @@
+import hashlib
 import json
-from typing import Dict, Any
+import os
+import pickle
+import struct
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Sidecar cache key: the format version followed by a hash of the config file
+# bytes it was built from. Bump _CACHE_VERSION whenever validation changes.
+_CACHE_VERSION_HEADER = struct.Struct("<q")
+_CACHE_VERSION = 7
+_CACHE_DIGEST_SIZE = 16
+
+# Number of 20 ms audio frames captured per microphone read.
+DEFAULT_AUDIO_BATCH_SIZE = 4
+
+# Discord snowflake IDs, given as digit strings or JSON numbers in config.json.
+_NUMERIC_FIELDS = frozenset({"GUILD_ID", "VOICE_CHANNEL_ID", "TEXT_CHANNEL_ID"})
+
+_REQUIRED_CONFIG: Dict[str, type] = {
+    "DISCORD_TOKEN": str,
+    "GUILD_ID": str,
+    "VOICE_CHANNEL_ID": str,
+    "TEXT_CHANNEL_ID": str,
+    "desktop_clients": list,
+    "MICROPHONE_ID": str,
+    "enable_media_events": bool,
+}
 
 
 class ConfigError(Exception):
@@ -8,10 +42,48 @@ class ConfigError(Exception):
     pass
 
 
+def _read_cached_config(cache_path: str, key: bytes) -> Optional[Dict[str, Any]]:
+    """Returns the cached configuration if it was built from the same file contents."""
+    try:
+        with open(cache_path, "rb") as cache_file:
+            data = cache_file.read()
+    except OSError:
+        return None
+
+    if data[: len(key)] != key:
+        return None
+
+    try:
+        return pickle.loads(data[len(key) :])
+    except Exception:
+        return None
+
+
+def _write_cached_config(cache_path: str, key: bytes, config: Dict[str, Any]) -> None:
+    """Atomically writes the validated configuration next to the config file."""
+    tmp_path = f"{cache_path}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    try:
+        # The cache holds the bot token too, so keep it private to the owner
+        with os.fdopen(os.open(tmp_path, flags, 0o600), "wb") as cache_file:
+            cache_file.write(key + pickle.dumps(config, pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is only an optimization; a read-only directory is fine.
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 def load_config(config_path: str = "config.json") -> Dict[str, Any]:
     """
     Loads and validates configuration from a JSON file.
 
+    The validated result is cached in a "<config_path>.cache" sidecar keyed on
+    a hash of the file contents, so unchanged configs skip parsing and
+    validation. Delete the sidecar to force a full reload.
+
     Args:
         config_path (str): Path to the configuration file. Defaults to "config.json"
 
@@ -22,51 +94,94 @@ def load_config(config_path: str = "config.json") -> Dict[str, Any]:
         ConfigError: If configuration is invalid or missing required fields
     """
     try:
-        with open(config_path, "r", encoding="utf-8") as config_file:
-            config = json.load(config_file)
+        # One unbuffered read of the whole file; O_BINARY matters on Windows
+        fd = os.open(config_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            data = os.read(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
     except FileNotFoundError:
         raise ConfigError(f"Error: {config_path} file not found.")
+    except OSError as e:
+        raise ConfigError(f"Error reading config file: {e}")
+
+    cache_path = f"{config_path}.cache"
+    digest = hashlib.blake2b(data, digest_size=_CACHE_DIGEST_SIZE).digest()
+    cache_key = _CACHE_VERSION_HEADER.pack(_CACHE_VERSION) + digest
+    config = _read_cached_config(cache_path, cache_key)
+    if config is not None:
+        return config
+
+    config = _parse_config(config_path, data)
+    _write_cached_config(cache_path, cache_key, config)
+    return config
+
+
+def _parse_config(config_path: str, data: bytes) -> Dict[str, Any]:
+    """Parses and validates the contents of the JSON configuration file."""
+    try:
+        config = _loads(data)
     except json.JSONDecodeError:
         raise ConfigError(f"Error: {config_path} is not a valid JSON file.")
     except Exception as e:
         raise ConfigError(f"Error reading config file: {e}")
 
-    required_config = {
-        "DISCORD_TOKEN": str,
-        "GUILD_ID": str,
-        "VOICE_CHANNEL_ID": str,
-        "TEXT_CHANNEL_ID": str,
-        "desktop_clients": list,
-        "MICROPHONE_ID": str,
-        "enable_media_events": bool,
-    }
-
-    for key, expected_type in required_config.items():
+    if not isinstance(config, dict):
+        raise ConfigError(f"Error: {config_path} must contain a JSON object.")
+
+    errors: List[str] = []
+    for key, expected_type in _REQUIRED_CONFIG.items():
         if key not in config:
-            raise ConfigError(f"Error: '{key}' is missing in {config_path}")
+            errors.append(f"Error: '{key}' is missing in {config_path}")
+            continue
 
-        if config[key] is None or (
-            expected_type != bool and not config[key] and key != "desktop_clients"
+        value = config[key]
+        if value is None or (
+            expected_type is not bool and not value and key != "desktop_clients"
         ):
-            raise ConfigError(f"Error: '{key}' has an empty value in {config_path}")
-
-        if not isinstance(config[key], expected_type):
-            raise ConfigError(
+            errors.append(f"Error: '{key}' has an empty value in {config_path}")
+        elif key in _NUMERIC_FIELDS and type(value) is int:
+            # IDs may also be written as plain JSON numbers
+            if value < 0:
+                errors.append(
+                    f"Error: '{key}' must be a digit string or a non-negative integer in {config_path}"
+                )
+        elif key in _NUMERIC_FIELDS and type(value) is not str:
+            errors.append(
+                f"Error: '{key}' must be a digit string or a non-negative integer in {config_path}"
+            )
+        elif not isinstance(value, expected_type):
+            errors.append(
                 f"Error: '{key}' must be of type {expected_type.__name__} in {config_path}"
             )
-
-    if not config["desktop_clients"]:
-        raise ConfigError(
-            f"Error: 'desktop_clients' must be a non-empty list in {config_path}"
+        elif key == "desktop_clients" and not value:
+            errors.append(
+                f"Error: 'desktop_clients' must be a non-empty list in {config_path}"
+            )
+        elif key == "desktop_clients" and not all(
+            type(client) is str and client for client in value
+        ):
+            # An empty name would match every app once compiled into a regex
+            errors.append(
+                f"Error: 'desktop_clients' must contain only non-empty strings in {config_path}"
+            )
+        elif key in _NUMERIC_FIELDS:
+            # int() would also accept signs, whitespace, underscores and non-ASCII digits
+            if value.isascii() and value.isdigit():
+                config[key] = int(value)
+            else:
+                errors.append(
+                    f"Error: '{key}' must contain only digits in {config_path}"
+                )
+
+    batch = config.setdefault("audio_batch_size", DEFAULT_AUDIO_BATCH_SIZE)
+    if type(batch) is not int or batch < 1:
+        errors.append(
+            f"Error: 'audio_batch_size' must be a positive integer in {config_path}"
         )
 
-    numeric_fields = ["GUILD_ID", "VOICE_CHANNEL_ID", "TEXT_CHANNEL_ID"]
-    for field in numeric_fields:
-        if not config[field].isdigit():
-            raise ConfigError(
-                f"Error: '{field}' must contain only digits in {config_path}"
-            )
-        config[field] = int(config[field])
+    if errors:
+        raise ConfigError("\n".join(errors))
 
     return config
 
@@ -89,22 +204,33 @@ class Config:
 
     def load(self, config_path: str = "config.json") -> None:
         """Load configuration from file."""
-        self._config = load_config(config_path)
+        if self._config is not None:
+            for key in self._config:
+                if self._is_exposed(key):
+                    self.__dict__.pop(key, None)
+
+        self._config = MappingProxyType(load_config(config_path))
+        # Expose values as real instance attributes so reads skip __getattr__
+        self.__dict__.update(
+            (key, value) for key, value in self._config.items() if self._is_exposed(key)
+        )
+
+    @staticmethod
+    def _is_exposed(key: str) -> bool:
+        """Private names and Config members are only reachable through config."""
+        return not key.startswith("_") and not hasattr(Config, key)
 
     @property
-    def config(self) -> Dict[str, Any]:
-        """Get configuration dictionary."""
+    def config(self) -> Mapping[str, Any]:
+        """Get read-only configuration mapping."""
         if self._config is None:
             raise ConfigError("Configuration not loaded. Call load() first.")
         return self._config
 
     def __getattr__(self, name: str) -> Any:
-        """Allow accessing config values as attributes."""
+        """Only reached for names that are not loaded config values."""
         if self._config is None:
             raise ConfigError("Configuration not loaded. Call load() first.")
-
-        if name in self._config:
-            return self._config[name]
         raise AttributeError(f"'{self.__class__.__name__}' has no attribute '{name}'")
 
 
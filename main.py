@@ -1,12 +1,17 @@
 import asyncio
+import ctypes
 import discord
+import functools
 import soundcard as sc
 import numpy as np
 import io
+import re
+import queue
+import random
+import threading
 from config_loader import config, ConfigError
-import zlib
-from typing import Optional, Dict, Any, Mapping
-from discord.ext import commands, tasks
+from typing import Optional, Dict, Any, List, Mapping, Tuple
+from discord.ext import commands
 from winsdk.windows.media.control import (
     GlobalSystemMediaTransportControlsSessionManager as MediaManager,
     GlobalSystemMediaTransportControlsSessionPlaybackStatus as PlaybackStatus,
@@ -14,6 +19,16 @@ from winsdk.windows.media.control import (
 from winsdk.windows.storage.streams import DataReader, Buffer, InputStreamOptions
 import logging
 
+try:
+    from google_crc32c import value as crc32
+except ImportError:
+    from zlib import crc32
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(name)s - %(asctime)s - %(levelname)s - %(message)s",
@@ -30,6 +45,10 @@ try:
     DESKTOP_CLIENTS = config.desktop_clients
     MICROPHONE_ID = config.MICROPHONE_ID
     ENABLE_MEDIA_EVENTS = config.enable_media_events
+    AUDIO_BATCH_SIZE = config.audio_batch_size
+    DESKTOP_CLIENTS_RE = re.compile(
+        "|".join(map(re.escape, DESKTOP_CLIENTS)), re.IGNORECASE
+    )
 
 except ConfigError as e:
     logging.error(e)
@@ -43,9 +62,10 @@ class ReconnectingVoiceClient:
         self.channel_id = channel_id
         self.voice_client = None
         self.reconnect_attempts = 0
-        self.max_reconnect_attempts = 5
         self.reconnect_delay = 5  # Initial delay in seconds
+        self.max_reconnect_delay = 60
         self.is_reconnecting = False
+        self.reconnect_task = None
 
     async def connect(self) -> None:
         """Establish initial connection to voice channel."""
@@ -75,11 +95,12 @@ class ReconnectingVoiceClient:
 
         self.is_reconnecting = True
 
-        while self.reconnect_attempts < self.max_reconnect_attempts:
+        # Keep retrying until reconnected or the handler is replaced (e.g. ^leave)
+        while self.bot.voice_handler is self:
             try:
                 self.reconnect_attempts += 1
                 logging.info(
-                    f"Attempting to reconnect... (Attempt {self.reconnect_attempts}/{self.max_reconnect_attempts})"
+                    f"Attempting to reconnect... (Attempt {self.reconnect_attempts})"
                 )
 
                 # Clean up existing voice client if any
@@ -102,13 +123,11 @@ class ReconnectingVoiceClient:
             except Exception as e:
                 logging.error(f"Reconnection attempt failed: {e}")
 
-            # Exponential backoff for retry delays
-            delay = min(self.reconnect_delay * (2 ** (self.reconnect_attempts - 1)), 60)
+            # Capped exponential backoff with jitter between retries
+            backoff = self.reconnect_delay * 2 ** min(self.reconnect_attempts - 1, 6)
+            delay = min(backoff, self.max_reconnect_delay) + random.uniform(0, 1)
             await asyncio.sleep(delay)
 
-        logging.fatal(
-            "Max reconnection attempts reached. Please check your connection and restart the bot."
-        )
         self.is_reconnecting = False
 
 
@@ -117,24 +136,23 @@ class MusicBot(commands.Bot):
         super().__init__(*args, **kwargs)
         self.voice_handler = None
 
-    async def setup_hook(self) -> None:
-        """This is called when the bot is done preparing data"""
-        self.check_connection.start()
-
-    @tasks.loop(seconds=30)
-    async def check_connection(self):
-        """Periodically check voice connection status."""
-        if self.voice_handler and (
-            not self.voice_handler.voice_client
-            or not self.voice_handler.voice_client.is_connected()
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        """Reconnect as soon as the bot is dropped from its voice channel."""
+        if (
+            self.voice_handler
+            and self.user is not None
+            and member.id == self.user.id
+            and before.channel is not None
+            and after.channel is None
         ):
             logging.info("Detected disconnection from voice channel")
             await self.voice_handler.handle_disconnect()
 
-    @check_connection.before_loop
-    async def before_check_connection(self):
-        await self.wait_until_ready()
-
 
 def release_audio_resources() -> None:
     """Releases resources of audio devices."""
@@ -145,6 +163,7 @@ def release_audio_resources() -> None:
         audio_task = None
 
     if mic_stream is not None:
+        mic_stream.close()
         mic_stream = None
     if microphone is not None:
         microphone = None
@@ -153,6 +172,13 @@ def release_audio_resources() -> None:
 CHUNK: int = 960
 CHANNELS: int = 2
 RATE: int = 48000
+FRAME_BYTES: int = CHUNK * CHANNELS * 2  # one 20 ms frame of s16le audio
+PLAYBACK_CHECK_TIMEOUT: float = 5.0
+MAX_QUEUED_CHUNKS: int = 4
+MAX_QUEUED_PACKETS: int = 5
+PACKET_READ_TIMEOUT: float = 1.0
+INT16_SCALE = np.float32(32767.0)
+MEDIA_CHANGE_DEBOUNCE: float = 1.0
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -163,9 +189,17 @@ microphone = None
 mic_stream = None
 audio_task = None
 
+THUMBNAIL_FALLBACK_SIZE: int = 524288
+media_manager: Optional[MediaManager] = None
+# (session, media properties token, playback info token) per hooked session
+hooked_sessions: List[Tuple[Any, Any, Any]] = []
+sessions_changed_hooked: bool = False
+text_channel: Optional[discord.TextChannel] = None
+
 
 last_media_info: Dict[str, Any] = {}
-track_crc: Mapping[int, bool] = {}
+last_track_key: Tuple[str, str] = ("", "")
+media_change_seq: Dict[str, int] = {}
 
 playback_status: Mapping[PlaybackStatus, str] = {
     PlaybackStatus.PLAYING: "Playing",
@@ -176,6 +210,16 @@ playback_status: Mapping[PlaybackStatus, str] = {
     PlaybackStatus.OPENED: "Opened",
 }
 
+_MEDIA_FIELDS = (
+    "title",
+    "artist",
+    "album_title",
+    "thumbnail",
+    "genres",
+    "track_number",
+    "subtitle",
+)
+
 
 async def stream_audio() -> None:
     """Handles streaming audio from the user's microphone to the Discord voice channel."""
@@ -191,21 +235,40 @@ async def stream_audio() -> None:
             )
 
         with mic.recorder(samplerate=RATE, channels=CHANNELS) as microphone:
-            mic_stream = MicrophoneStream(microphone, RATE)
+            loop = asyncio.get_running_loop()
+            stream = MicrophoneStream(microphone, RATE, AUDIO_BATCH_SIZE, loop)
+            mic_stream = stream
 
-            while voice_client.is_connected():
-                if not voice_client.is_playing():
+            # The producer thread must stop before the recorder is closed
+            try:
+                playback_finished = asyncio.Event()
+
+                def after_playback(error: Optional[Exception]) -> None:
+                    # Called from discord.py's audio player thread
+                    if error:
+                        logging.error(f"Audio playback stopped with error: {error}")
+                    loop.call_soon_threadsafe(playback_finished.set)
+
+                while voice_client.is_connected() and not stream.closed:
+                    if not voice_client.is_playing():
+                        try:
+                            audio_source = MicrophoneOpusAudio(stream)
+                            voice_client.play(audio_source, after=after_playback)
+                        except Exception as e:
+                            logging.error(f"Error playing audio: {e}")
+                            break
+
+                    # Sleep until playback ends; the timeout only guards against
+                    # a player we did not start or a missed callback.
                     try:
-                        audio_source = discord.FFmpegPCMAudio(
-                            mic_stream,
-                            pipe=True,
-                            before_options="-f s16le -ar 48000 -ac 2",
+                        await asyncio.wait_for(
+                            playback_finished.wait(), timeout=PLAYBACK_CHECK_TIMEOUT
                         )
-                        voice_client.play(audio_source)
-                    except Exception as e:
-                        logging.error(f"Error playing audio: {e}")
-                        break
-                await asyncio.sleep(0.1)
+                    except asyncio.TimeoutError:
+                        pass
+                    playback_finished.clear()
+            finally:
+                stream.close()
 
     except IndexError as e:
         logging.error(f"Error: {e}")
@@ -217,82 +280,309 @@ async def stream_audio() -> None:
         logging.error("KeyboardInterrupt detected, cleaning up resources...")
 
 
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def f32_to_i16(src: np.ndarray, dst: np.ndarray) -> None:
+        """Scales float samples in [-1, 1] to int16 in place, with clipping.
+
+        There is no bounds checking: src must have the same shape as dst.
+        """
+        for i in range(dst.shape[0]):
+            for j in range(dst.shape[1]):
+                value = src[i, j] * 32767.0
+                dst[i, j] = round(min(max(value, -32768.0), 32767.0))
+
+    # Compile (or load from the on-disk cache) now rather than on the first chunk
+    f32_to_i16(
+        np.zeros((1, CHANNELS), dtype=np.float32),
+        np.empty((1, CHANNELS), dtype=np.int16),
+    )
+else:
+    f32_to_i16 = None
+
+
 class MicrophoneStream(io.RawIOBase):
-    def __init__(self, microphone: Any, samplerate: int) -> None:
+    def __init__(
+        self,
+        microphone: Any,
+        samplerate: int,
+        batch: int = 1,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
         self.microphone = microphone
         self.samplerate = samplerate
-        self.buffer = b""
-
-    def read(self, size: int = -1) -> bytes:
-        if size == -1:
-            return self._read_chunk()
-
-        while len(self.buffer) < size:
-            self.buffer += self._read_chunk()
+        self.numframes = CHUNK * batch
+        # Event loop that owns audio_task; recording errors release resources there
+        self._loop = loop
+        # Scratch buffer reused by the NumPy fallback in _read_chunk
+        self._f32: Optional[np.ndarray] = None
+        if f32_to_i16 is None:
+            self._f32 = np.empty((self.numframes, CHANNELS), dtype=np.float32)
+
+        # Recording runs ahead of the reader on its own thread, writing into a
+        # fixed ring of chunk slots. The producer fills the slot at _tail, the
+        # reader drains the slot at _head from byte offset _head_pos, and
+        # _fill counts the slots recorded but not yet fully read. When the
+        # ring is full the producer drops the oldest slot instead of waiting.
+        self._ring = np.empty(
+            (MAX_QUEUED_CHUNKS, self.numframes, CHANNELS), dtype=np.int16
+        )
+        self._ring_bytes = memoryview(self._ring).cast("B")
+        self._slot_bytes = self._ring[0].nbytes
+        self._head = 0
+        self._head_pos = 0
+        self._tail = 0
+        self._fill = 0
+        self._overrun = False
+        self._ring_changed = threading.Condition()
+        self._stop_event = threading.Event()
+        self._producer_thread = threading.Thread(
+            target=self._producer, name="MicrophoneStream", daemon=True
+        )
+        self._producer_thread.start()
 
-        data = self.buffer[:size]
-        self.buffer = self.buffer[size:]
-        return data
+    def _producer(self) -> None:
+        """Records and converts chunks until the stream is closed."""
+        while True:
+            with self._ring_changed:
+                if self._stop_event.is_set():
+                    return
+                if self._fill == MAX_QUEUED_CHUNKS:
+                    # The reader fell behind: drop the oldest chunk so capture
+                    # keeps pace with the device and latency stays bounded.
+                    if not self._overrun:
+                        logging.warning(
+                            "Audio reader is falling behind, dropping oldest audio"
+                        )
+                        self._overrun = True
+                    self._head = (self._head + 1) % MAX_QUEUED_CHUNKS
+                    self._head_pos = 0
+                    self._fill -= 1
+                slot = self._tail
+
+            # The reader never touches a slot that has not been counted in _fill
+            recorded = self._read_chunk(self._ring[slot])
+
+            with self._ring_changed:
+                if recorded:
+                    self._tail = (slot + 1) % MAX_QUEUED_CHUNKS
+                    self._fill += 1
+                else:
+                    self._stop_event.set()
+                self._ring_changed.notify_all()
+
+    def readinto(self, b: Any) -> int:
+        """Fills b with recorded audio, blocking until it is full or the stream stops."""
+        with memoryview(b) as view, view.cast("B") as dest:
+            filled = 0
+            with self._ring_changed:
+                while filled < len(dest):
+                    while not self._fill and not self._stop_event.is_set():
+                        self._ring_changed.wait()
+                    if not self._fill:
+                        break
 
-    def _read_chunk(self) -> bytes:
+                    # Copy under the lock: the producer may drop this slot
+                    start = self._head * self._slot_bytes + self._head_pos
+                    take = min(len(dest) - filled, self._slot_bytes - self._head_pos)
+                    dest[filled : filled + take] = self._ring_bytes[
+                        start : start + take
+                    ]
+                    filled += take
+                    self._head_pos += take
+
+                    if self._head_pos == self._slot_bytes:
+                        self._head = (self._head + 1) % MAX_QUEUED_CHUNKS
+                        self._head_pos = 0
+                        self._fill -= 1
+                        self._overrun = False
+            return filled
+
+    def close(self) -> None:
+        """Stops the producer thread and closes the stream."""
+        with self._ring_changed:
+            self._stop_event.set()
+            self._ring_changed.notify_all()
+        if self._producer_thread is not threading.current_thread():
+            self._producer_thread.join(timeout=1)
+        super().close()
+
+    def _read_chunk(self, out: np.ndarray) -> bool:
+        """Records one chunk and writes it to out as int16 samples."""
         if self.microphone is None:
             raise RuntimeError("Microphone has been closed or is unavailable.")
 
         try:
-            data = self.microphone.record(numframes=CHUNK)
-            int_data = (data * 32767).astype(np.int16)
-            self.microphone.flush()
-            return int_data.tobytes()
+            data = self.microphone.record(numframes=self.numframes)
+            if f32_to_i16 is not None:
+                # The compiled kernel would read past a short or narrow recording
+                if data.shape != out.shape:
+                    raise ValueError(
+                        f"Recorded shape {data.shape} does not match {out.shape}"
+                    )
+                f32_to_i16(data, out)
+            else:
+                np.multiply(
+                    data, INT16_SCALE, out=self._f32, dtype=np.float32, casting="unsafe"
+                )
+                np.rint(self._f32, out=self._f32)
+                # Samples slightly outside [-1, 1] must not wrap around
+                np.clip(self._f32, -32768.0, 32767.0, out=self._f32)
+                out[:] = self._f32
+            return True
         except Exception as e:
-            release_audio_resources()
-            return b""
+            logging.error(f"Error recording audio: {e}")
+            # This runs on the producer thread, but audio_task belongs to the loop
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(release_audio_resources)
+            return False
 
     def readable(self) -> bool:
         return True
 
 
-async def read_stream_into_buffer(stream_ref: Any, buffer: Buffer) -> None:
-    """Reads data from a media stream into a buffer."""
+class MicrophoneOpusAudio(discord.AudioSource):
+    """Feeds Opus packets encoded from a MicrophoneStream to discord.py.
+
+    The stream is already 48 kHz stereo s16le, so no FFmpeg process is needed.
+    Frames are encoded on a worker thread ahead of playback, leaving discord.py's
+    audio player thread with nothing to do but send packets on its 20 ms clock.
+    """
+
+    def __init__(self, stream: MicrophoneStream) -> None:
+        self.stream = stream
+        self._encoder = discord.opus.Encoder()
+        self._packets: "queue.Queue[bytes]" = queue.Queue(maxsize=MAX_QUEUED_PACKETS)
+        self._stop_event = threading.Event()
+        self._encoder_thread = threading.Thread(
+            target=self._encode_frames, name="MicrophoneOpusAudio", daemon=True
+        )
+        self._encoder_thread.start()
+
+    def _encode_frames(self) -> None:
+        """Encodes 20 ms PCM frames until the stream ends or the source is cleaned up."""
+        # The encoder hands its input to libopus through ctypes.cast, which
+        # accepts a ctypes array as well as bytes, so frames are read straight
+        # into one reused array instead of being copied into new bytes.
+        frame = (ctypes.c_char * FRAME_BYTES)()
+        try:
+            while not self._stop_event.is_set():
+                if self.stream.readinto(frame) != FRAME_BYTES:
+                    break
+                packet = self._encoder.encode(frame, self._encoder.SAMPLES_PER_FRAME)
+                self._put(packet)
+        except Exception as e:
+            logging.error(f"Error encoding audio: {e}")
+        finally:
+            # An empty packet tells the audio player that the source has ended.
+            # It must get through even after cleanup, so make room if needed.
+            while True:
+                try:
+                    self._packets.put_nowait(b"")
+                    break
+                except queue.Full:
+                    try:
+                        self._packets.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def _put(self, packet: bytes) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self._packets.put(packet, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self) -> bytes:
+        try:
+            return self._packets.get(timeout=PACKET_READ_TIMEOUT)
+        except queue.Empty:
+            # Nothing arrived in time; end playback so stream_audio restarts it
+            return b""
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self) -> None:
+        self._stop_event.set()
+
+
+async def read_stream_bytes(stream_ref: Any) -> bytearray:
+    """Reads a media stream (e.g. a thumbnail) into a new bytearray."""
     readable_stream = await stream_ref.open_read_async()
-    await readable_stream.read_async(
-        buffer, buffer.capacity, InputStreamOptions.READ_AHEAD
-    )
+    # Album art is virtually never larger than the fallback when the size is unknown
+    size = int(readable_stream.size) or THUMBNAIL_FALLBACK_SIZE
+
+    # A buffer per call: handlers for different sessions can interleave at the await
+    buffer = Buffer(size)
+    await readable_stream.read_async(buffer, size, InputStreamOptions.READ_AHEAD)
+    data = bytearray(buffer.length)
+    DataReader.from_buffer(buffer).read_bytes(data)
+    return data
+
+
+async def get_media_manager() -> MediaManager:
+    """Returns the media session manager, requesting it only once."""
+    global media_manager
+    if media_manager is None:
+        media_manager = await MediaManager.request_async()
+    return media_manager
 
 
 async def extract_media_info(session) -> Optional[Dict[str, Any]]:
     """Extracts media information and thumbnail for the current session."""
     info = await session.try_get_media_properties_async()
-    info_dict = {
-        song_attr: info.__getattribute__(song_attr)
-        for song_attr in dir(info)
-        if song_attr[0] != "_"
-    }
-    info_dict["genres"] = list(info_dict["genres"])
+    info_dict = {field: getattr(info, field, None) for field in _MEDIA_FIELDS}
+    info_dict["genres"] = list(info_dict["genres"] or ())
     return info_dict
 
 
 async def get_current_media_info():
-    manager = await MediaManager.request_async()
+    manager = await get_media_manager()
     sessions = manager.get_sessions()
 
+    # Prefer a playing session; otherwise fall back to the first supported one
+    selected = None
+    selected_status = None
     for session in sessions:
-        source_app = session.source_app_user_model_id
-        if source_app and any(client in source_app for client in DESKTOP_CLIENTS):
-            media_info = await extract_media_info(session)
-            playback_info = session.get_playback_info()
-            status = playback_status.get(playback_info.playback_status, "Unknown")
-            return media_info, status
-    return None, None
+        if not is_supported_app(session.source_app_user_model_id):
+            continue
+        session_status = session.get_playback_info().playback_status
+        if session_status == PlaybackStatus.PLAYING:
+            selected, selected_status = session, session_status
+            break
+        if selected is None:
+            selected, selected_status = session, session_status
+
+    if selected is None:
+        return None, None
+
+    media_info = await extract_media_info(selected)
+    status = playback_status.get(selected_status, "Unknown")
+    return media_info, status
 
 
 def get_track_crc(title: str, artist: str) -> int:
     """Generate CRC for track information."""
-    return zlib.crc32(f"{title} - {artist}".encode("utf-8"))
+    return crc32(f"{title} - {artist}".encode("utf-8"))
+
+
+@functools.lru_cache(maxsize=128)
+def is_supported_app(source_app: Any) -> bool:
+    """Check if the source app matches one of the configured desktop clients.
+
+    Source app IDs are stable per session, so results are memoized.
+    """
+    if not source_app or not isinstance(source_app, str):
+        return False
+    return DESKTOP_CLIENTS_RE.search(source_app) is not None
 
 
 def is_valid_string(s: Any) -> bool:
     """Check if the input is a non-empty string."""
-    return isinstance(s, str) and len(s.strip()) > 0
+    return type(s) is str and bool(s) and not s.isspace()
 
 
 async def send_embed_message(channel: discord.TextChannel, **kwargs: Any) -> None:
@@ -331,10 +621,8 @@ async def update_presence(
     title: str, artist: str, album: Optional[str], status: str
 ) -> None:
     """Update bot's presence with current track information."""
-    name = f"{title} - {artist}"
-    if album:
-        name += f" ({album})"
-    name += f". Status: {status}"
+    album_part = f" ({album})" if album else ""
+    name = f"{title} - {artist}{album_part}. Status: {status}"
 
     activity = discord.Activity(
         type=discord.ActivityType.listening,
@@ -347,69 +635,71 @@ async def process_media_info(
     media_info: Dict[str, Any], status: str, session=None
 ) -> None:
     """Process media information and update bot's presence and Discord channel."""
-    global last_media_info, track_crc
+    global last_media_info, last_track_key, text_channel
 
     title = media_info.get("title", "")
     artist = media_info.get("artist", "")
-    album = media_info.get("album_title", "")
 
-    if not (is_valid_string(title) and is_valid_string(artist)):
+    # Windows fires several property-change events per track; bail out on
+    # repeats before validating anything or touching the thumbnail. Only
+    # valid pairs are ever stored, so a match needs no further checks.
+    track_key = (title, artist)
+    if track_key == last_track_key:
         return
 
-    current_track_crc = get_track_crc(title, artist)
-
-    if current_track_crc not in track_crc or not track_crc[current_track_crc]:
-        track_crc = {crc: False for crc in track_crc}
-        track_crc[current_track_crc] = True
-
-        thumbnail_bytes = None
-        if "thumbnail" in media_info:
-            thumb_stream_ref = media_info["thumbnail"]
-            if thumb_stream_ref:
-                thumb_read_buffer = Buffer(5000000)
-                await read_stream_into_buffer(thumb_stream_ref, thumb_read_buffer)
-                thumbnail_bytes = bytearray(thumb_read_buffer.length)
-                reader = DataReader.from_buffer(thumb_read_buffer)
-                reader.read_bytes(thumbnail_bytes)
-
-        channel = bot.get_channel(TEXT_CHANNEL_ID)
-        if channel:
-            await send_embed_message(
-                channel=channel,
-                title=title,
-                artist=artist,
-                album=album if is_valid_string(album) else None,
-                thumbnail_bytes=thumbnail_bytes,
-                current_track_crc=current_track_crc,
-            )
-        else:
-            logging.error(
-                f"Error: Could not find text channel with ID {TEXT_CHANNEL_ID}"
-            )
+    if not (is_valid_string(title) and is_valid_string(artist)):
+        return
+    last_track_key = track_key
 
-        await update_presence(
-            title, artist, album if is_valid_string(album) else None, status
+    album = media_info.get("album_title", "")
+    if not is_valid_string(album):
+        album = None
+
+    thumbnail_bytes = None
+    current_track_crc = 0
+    thumb_stream_ref = media_info.get("thumbnail")
+    if thumb_stream_ref:
+        thumbnail_bytes = await read_stream_bytes(thumb_stream_ref)
+        # The CRC only names the thumbnail attachment
+        current_track_crc = get_track_crc(title, artist)
+
+    if text_channel is None:
+        text_channel = bot.get_channel(TEXT_CHANNEL_ID)
+    if text_channel:
+        await send_embed_message(
+            channel=text_channel,
+            title=title,
+            artist=artist,
+            album=album,
+            thumbnail_bytes=thumbnail_bytes,
+            current_track_crc=current_track_crc,
         )
+    else:
+        logging.error(f"Error: Could not find text channel with ID {TEXT_CHANNEL_ID}")
+
+    await update_presence(title, artist, album, status)
 
-        last_media_info = media_info
+    last_media_info = media_info
 
 
 async def handle_media_change(session, args) -> None:
     """Handler for changing media properties (e.g., changing a track)."""
-    await asyncio.sleep(1)
-
     source_app = session.source_app_user_model_id
-    if (
-        source_app is not None
-        and isinstance(source_app, str)
-        and any(client in source_app for client in DESKTOP_CLIENTS)
-    ):
-        media_info = await extract_media_info(session)
-        playback_info = session.get_playback_info()
-        status = playback_status.get(playback_info.playback_status, "Unknown")
-        await process_media_info(media_info, status, session)
-    else:
+    if not is_supported_app(source_app):
         logging.error(f"Source app '{source_app}' is not supported.")
+        return
+
+    # Debounce bursts of events per app: only the last one to arrive is processed
+    seq = media_change_seq.get(source_app, 0) + 1
+    media_change_seq[source_app] = seq
+    await asyncio.sleep(MEDIA_CHANGE_DEBOUNCE)
+    if seq != media_change_seq[source_app]:
+        return
+
+    media_info = await extract_media_info(session)
+    playback_info = session.get_playback_info()
+    status = playback_status.get(playback_info.playback_status, "Unknown")
+    await process_media_info(media_info, status, session)
 
 
 async def handle_playback_change(session, args) -> None:
@@ -417,11 +707,7 @@ async def handle_playback_change(session, args) -> None:
     global last_media_info
     source_app = session.source_app_user_model_id
 
-    if (
-        source_app is not None
-        and isinstance(source_app, str)
-        and any(client in source_app for client in DESKTOP_CLIENTS)
-    ):
+    if is_supported_app(source_app):
         playback_info = session.get_playback_info()
         status = playback_status.get(playback_info.playback_status, "Unknown")
         await update_presence(
@@ -432,34 +718,69 @@ async def handle_playback_change(session, args) -> None:
         )
 
 
+def on_media_properties_changed(
+    session, args, *, loop: asyncio.AbstractEventLoop
+) -> None:
+    """WinRT callback: forwards media property changes to the event loop."""
+    asyncio.run_coroutine_threadsafe(handle_media_change(session, args), loop)
+
+
+def on_playback_info_changed(session, args, *, loop: asyncio.AbstractEventLoop) -> None:
+    """WinRT callback: forwards playback state changes to the event loop."""
+    asyncio.run_coroutine_threadsafe(handle_playback_change(session, args), loop)
+
+
+def on_sessions_changed(manager, args, *, loop: asyncio.AbstractEventLoop) -> None:
+    """WinRT callback: hooks media sessions that appeared after startup."""
+    loop.call_soon_threadsafe(hook_media_sessions, manager, loop)
+
+
+def hook_media_sessions(manager, loop: asyncio.AbstractEventLoop) -> None:
+    """Registers media event handlers on every current session."""
+    media_callback = functools.partial(on_media_properties_changed, loop=loop)
+    playback_callback = functools.partial(on_playback_info_changed, loop=loop)
+
+    # Session wrappers are not stable across get_sessions() calls and several
+    # sessions may share an app ID, so re-register on the fresh list each time
+    for session, media_token, playback_token in hooked_sessions:
+        try:
+            session.remove_media_properties_changed(media_token)
+            session.remove_playback_info_changed(playback_token)
+        except OSError:
+            # The session's app has already exited
+            pass
+    hooked_sessions.clear()
+
+    for session in manager.get_sessions():
+        media_token = session.add_media_properties_changed(media_callback)
+        playback_token = session.add_playback_info_changed(playback_callback)
+        hooked_sessions.append((session, media_token, playback_token))
+
+
 async def setup_media_events() -> None:
     """Setting up event handlers for Windows Media."""
+    global sessions_changed_hooked
     if not ENABLE_MEDIA_EVENTS:
         logging.info("Media events are disabled in configuration.")
         return
-    manager = await MediaManager.request_async()
+    manager = await get_media_manager()
     loop = asyncio.get_running_loop()
 
-    for session in manager.get_sessions():
-        session.add_media_properties_changed(
-            lambda s, args: asyncio.run_coroutine_threadsafe(
-                handle_media_change(s, args), loop
-            )
-        )
-        session.add_playback_info_changed(
-            lambda s, args: asyncio.run_coroutine_threadsafe(
-                handle_playback_change(s, args), loop
-            )
-        )
+    hook_media_sessions(manager, loop)
+    if not sessions_changed_hooked:
+        manager.add_sessions_changed(functools.partial(on_sessions_changed, loop=loop))
+        sessions_changed_hooked = True
 
     logging.info("Media event handlers registered.")
 
 
 @bot.event
 async def on_ready() -> None:
-    global audio_task, last_media_info
+    global last_media_info, text_channel
     logging.info(f"Logged in as {bot.user.name}")
 
+    text_channel = bot.get_channel(TEXT_CHANNEL_ID)
+
     if ENABLE_MEDIA_EVENTS:
         media_info, status = await get_current_media_info()
         if media_info:
@@ -479,23 +800,32 @@ async def on_ready() -> None:
 
     # Initialize the voice handler
     bot.voice_handler = ReconnectingVoiceClient(bot, GUILD_ID, VOICE_CHANNEL_ID)
-    await bot.voice_handler.connect()
-
-    if audio_task is None or audio_task.done():
-        audio_task = asyncio.create_task(stream_audio())
+    await connect_voice(bot.voice_handler)
 
     await setup_media_events()
 
 
+async def connect_voice(handler: ReconnectingVoiceClient) -> None:
+    """Connects the voice handler and starts streaming, retrying on failure."""
+    global audio_task
+    await handler.connect()
+
+    if handler.voice_client and handler.voice_client.is_connected():
+        if audio_task is None or audio_task.done():
+            audio_task = asyncio.create_task(stream_audio())
+    else:
+        # connect() only logs failures and no voice state update will follow,
+        # so keep retrying in the background; streaming starts on success
+        handler.reconnect_task = asyncio.create_task(handler.handle_disconnect())
+
+
 @bot.command()
 async def join(ctx: commands.Context) -> None:
     if not bot.voice_handler or not bot.voice_handler.voice_client:
         if ctx.author.voice:
             channel = ctx.author.voice.channel
             bot.voice_handler = ReconnectingVoiceClient(bot, ctx.guild.id, channel.id)
-            await bot.voice_handler.connect()
-            if audio_task is None or audio_task.done():
-                audio_task = asyncio.create_task(stream_audio())
+            await connect_voice(bot.voice_handler)
         else:
             await ctx.send("You are not connected to a voice channel.")
     else:
@@ -505,10 +835,12 @@ async def join(ctx: commands.Context) -> None:
 @bot.command()
 async def leave(ctx: commands.Context) -> None:
     if bot.voice_handler and bot.voice_handler.voice_client:
-        release_audio_resources()
-        if bot.voice_handler.voice_client.is_connected():
-            await bot.voice_handler.voice_client.disconnect()
+        # Drop the handler first so the disconnect is not treated as a drop
+        voice_client = bot.voice_handler.voice_client
         bot.voice_handler = None
+        release_audio_resources()
+        if voice_client.is_connected():
+            await voice_client.disconnect()
     else:
         await ctx.send("The bot is not connected to a voice channel.")
 